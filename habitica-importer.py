@@ -1,22 +1,60 @@
+import asyncio
 import csv
+import itertools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
 import os
 import sys
 import yaml
 import re
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 
+from textual import work
 from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer, Static, ListItem, ListView, Label, Input, Button
-from rich.markdown import Markdown as RichMarkdown
+from rich.console import Group
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
 from textual.containers import Container, Horizontal, Vertical, Grid
 from textual.binding import Binding
+from textual.message import Message
 from textual.screen import ModalScreen
+from textual.timer import Timer
 
 # Configuration
 BASE_URL = "https://habitica.com/api/v3"
+TASK_TYPES = ("habits", "dailys", "todos", "rewards")
+# Singular type names accepted when creating a task
+TASK_TYPE_NAMES = ("habit", "daily", "todo", "reward")
+IMPORT_CONCURRENCY = 8
+# Tasks per POST when importing; /tasks/user accepts an array body
+IMPORT_BATCH_SIZE = 100
+# Longest Retry-After (seconds) honoured before retrying a request
+MAX_RETRY_AFTER = 10
+# Rendered detail panes kept for quick scroll-back
+DETAIL_CACHE_SIZE = 64
+# Idle time after the last highlight before the detail pane redraws
+DETAIL_DEBOUNCE = 0.05
+# Freshness window for cached GETs when the server sends no ETag
+CACHE_TTL = 5.0
+
+# Obsidian-style unchecked checklist item: "- [ ] text"
+_MD_CHECK = re.compile(r"-\s*\[\s*\]\s*(.*)")
+
+_PRIORITY_MAP = {0.1: "Trivial", 1: "Easy", 1.5: "Medium", 2: "Hard"}
+# Upper bounds for task value colors; anything above the last is blue
+_COLOR_THRESHOLDS = ((-10, "red"), (-1, "orange1"), (1, "yellow"), (5, "green"))
+
+class _CappedRetry(Retry):
+    # Never let a server's Retry-After park a worker thread for long
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_RETRY_AFTER)
 
 class HabiticaClient:
     def __init__(self, user_id, api_token):
@@ -26,16 +64,69 @@ class HabiticaClient:
             "x-client": f"{user_id}-habitica-cli",
             "Content-Type": "application/json"
         }
+        # Persistent session so keep-alive reuses the TLS connection across calls
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Retry transient failures with backoff. POST is left out because scoring
+        # and creating tasks are not idempotent; connect errors still retry.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=IMPORT_CONCURRENCY,
+            max_retries=_CappedRetry(
+                total=3,
+                connect=3,
+                read=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "PUT", "DELETE"]),
+                # Hand back the last response so raise_for_status reports its status
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        # Called with a message when a request ultimately fails; the TUI sets this
+        self.on_error: Optional[Callable[[str], None]] = None
+        # GET responses keyed by endpoint+params: (etag, body, fetched_at)
+        self._etag_cache: Dict[str, Tuple[Optional[str], Any, float]] = {}
 
     def _api_call(self, method, endpoint, payload=None, params=None):
         url = f"{BASE_URL}/{endpoint}"
+        headers = {}
+        cache_key = None
+        cached = None
+        if method == "GET":
+            cache_key = f"{endpoint}?{sorted((params or {}).items())}"
+            cached = self._etag_cache.get(cache_key)
+            if cached:
+                etag, body, fetched_at = cached
+                if etag:
+                    headers["If-None-Match"] = etag
+                elif time.monotonic() - fetched_at < CACHE_TTL:
+                    return body
+        else:
+            # Any write can change what the task lists return
+            self._etag_cache.clear()
         try:
-            response = requests.request(method, url, headers=self.headers, json=payload, params=params)
+            response = self.session.request(method, url, json=payload, params=params, headers=headers, timeout=10)
+            if response.status_code == 304 and cached:
+                self._etag_cache[cache_key] = (cached[0], cached[1], time.monotonic())
+                return cached[1]
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+            if cache_key:
+                self._etag_cache[cache_key] = (response.headers.get("ETag"), result, time.monotonic())
+            return result
+        except requests.exceptions.HTTPError as e:
+            self._report_error(f"{method} {endpoint} failed: HTTP {e.response.status_code}")
+            return None
         except requests.exceptions.RequestException as e:
+            self._report_error(f"{method} {endpoint} failed: {e}")
             return None
 
+    def _report_error(self, message):
+        if self.on_error:
+            self.on_error(message)
+
     def list_tasks(self, task_type=None):
         params = {"type": task_type} if task_type else {}
         result = self._api_call("GET", "tasks/user", params=params)
@@ -45,6 +136,9 @@ class HabiticaClient:
         payload = {"text": text, "type": task_type, "notes": notes, "priority": priority}
         return self._api_call("POST", "tasks/user", payload=payload)
 
+    def create_tasks_bulk(self, tasks):
+        return self._api_call("POST", "tasks/user", payload=tasks)
+
     def update_task(self, task_id, **updates):
         return self._api_call("PUT", f"tasks/{task_id}", payload=updates)
 
@@ -100,36 +194,65 @@ class EditTaskModal(ModalScreen):
             self.dismiss(None)
 
 class TaskDetail(Static):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache: "OrderedDict[Tuple, Group]" = OrderedDict()
+
     def update_task(self, task: Optional[Dict[str, Any]]):
         if not task:
             self.update("No task selected")
             return
+
+        # Scores change value without touching updatedAt, so key on both
+        key = (task['id'], task.get('updatedAt'), task.get('value'))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.update(cached)
+            return
         
         # Determine Color based on value (score)
         val = task.get('value', 0)
-        color = "white"
-        if val < -10: color = "red"
-        elif val < -1: color = "orange"
-        elif val < 1: color = "yellow"
-        elif val < 5: color = "green"
-        else: color = "blue"
-
-        priority_map = {0.1: "Trivial", 1: "Easy", 1.5: "Medium", 2: "Hard"}
-        priority_str = priority_map.get(task.get('priority', 1), str(task.get('priority', 1)))
-
-        md = f"""# {task['text']}
-
-**Type:** {task['type'].upper()}
-**Value:** [{color}]{val:.2f}[/{color}]
-**Priority:** {priority_str}
+        color = "blue"
+        for limit, limit_color in _COLOR_THRESHOLDS:
+            if val < limit:
+                color = limit_color
+                break
+
+        priority_str = _PRIORITY_MAP.get(task.get('priority', 1), str(task.get('priority', 1)))
+
+        # Build the renderable directly; no Markdown parsing per highlight
+        fields = Table.grid(padding=(0, 1))
+        fields.add_column(style="bold")
+        fields.add_column()
+        fields.add_row("Type:", task['type'].upper())
+        fields.add_row("Value:", Text(f"{val:.2f}", style=color))
+        fields.add_row("Priority:", priority_str)
+
+        notes = task.get('notes')
+        notes_panel = Panel(
+            Text(notes) if notes else Text("No notes", style="italic"),
+            title="Notes",
+            title_align="left"
+        )
 
-## Notes
-{task.get('notes', '_No notes_')}
+        rendered = Group(
+            Text(task['text'], style="bold"),
+            Text(),
+            fields,
+            Text(),
+            notes_panel,
+            Text(f"ID: {task['id']}", style="dim")
+        )
+        self._cache[key] = rendered
+        if len(self._cache) > DETAIL_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        self.update(rendered)
 
----
-**ID:** `{task['id']}`
-"""
-        self.update(RichMarkdown(md))
+class TasksLoaded(Message):
+    def __init__(self, tasks_by_type: Dict[str, List[Dict[str, Any]]]):
+        super().__init__()
+        self.tasks_by_type = tasks_by_type
 
 class HabiticaTUI(App):
     CSS = """
@@ -215,8 +338,20 @@ class HabiticaTUI(App):
     def __init__(self, client: HabiticaClient):
         super().__init__()
         self.client = client
+        self.client.on_error = self.on_api_error
         self.selected_type = "todos"
         self.tasks = []
+        # (id, text, class) of each row currently mounted in the task list
+        self._prev_rows: List[Tuple[str, str, str]] = []
+        self._detail_timer: Optional[Timer] = None
+        # Last fetched list per category; self.tasks aliases the selected one
+        self._tasks_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        # Set until the startup prefetch lands; switches wait for it instead of fetching
+        self._prefetching = False
+
+    def on_api_error(self, message: str):
+        # Client calls run in worker threads; notify is thread-safe
+        self.notify(message, severity="error")
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -237,24 +372,103 @@ class HabiticaTUI(App):
         yield Footer()
 
     def on_mount(self) -> None:
-        self.refresh_tasks()
+        # Paint the shell straight away; tasks arrive via TasksLoaded
+        self._prefetching = True
+        self.load_tasks()
         self.query_one("#type-list").focus()
 
-    def refresh_tasks(self):
-        self.tasks = self.client.list_tasks(self.selected_type)
-        task_list = self.query_one("#task-list", ListView)
-        task_list.clear()
-        
-        for task in self.tasks:
-            val = task.get('value', 0)
-            cls = "task-neutral"
-            if val > 1: cls = "task-positive"
-            if val < -1: cls = "task-negative"
-            
-            task_list.append(ListItem(Label(task['text'], classes=cls)))
-            
+    @work(exclusive=True, group="load")
+    async def load_tasks(self):
+        # Fetch every category at once so switching between them is local
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self.client.list_tasks, task_type) for task_type in TASK_TYPES)
+        )
+        self.post_message(TasksLoaded(dict(zip(TASK_TYPES, results))))
+
+    async def on_tasks_loaded(self, message: TasksLoaded) -> None:
+        self._prefetching = False
+        for task_type, tasks in message.tasks_by_type.items():
+            await self._show_tasks(task_type, tasks)
+
+    async def refresh_tasks(self):
+        task_type = self.selected_type
+        tasks = await asyncio.to_thread(self.client.list_tasks, task_type)
+        await self._show_tasks(task_type, tasks)
+
+    async def _show_tasks(self, task_type: str, tasks: List[Dict[str, Any]]):
+        self._tasks_by_type[task_type] = tasks
+        if task_type != self.selected_type:
+            # The category changed while we were waiting; that refresh wins
+            return
+        self.tasks = tasks
+        await self._sync_task_list()
         self.update_detail()
 
+    # Patch the task list to match self.tasks without remounting unchanged rows
+    async def _sync_task_list(self):
+        task_list = self.query_one("#task-list", ListView)
+        new_ids = [task['id'] for task in self.tasks]
+        old_ids = [row[0] for row in self._prev_rows]
+        if new_ids == old_ids:
+            for idx in range(len(self.tasks)):
+                self._rerender_row(idx)
+            return
+
+        new_set = set(new_ids)
+        removed = [idx for idx, task_id in enumerate(old_ids) if task_id not in new_set]
+        if removed:
+            await task_list.remove_items(removed)
+            self._prev_rows = [row for row in self._prev_rows if row[0] in new_set]
+
+        kept = {row[0] for row in self._prev_rows}
+        if [task_id for task_id in new_ids if task_id in kept] != [row[0] for row in self._prev_rows]:
+            # Surviving rows were reordered; rebuilding is simpler than moving them
+            await task_list.clear()
+            self._prev_rows = []
+            kept = set()
+
+        # Walk the new order, patching kept rows and inserting runs of new ones
+        idx = 0
+        while idx < len(self.tasks):
+            if new_ids[idx] in kept:
+                self._rerender_row(idx)
+                idx += 1
+                continue
+            start = idx
+            while idx < len(self.tasks) and new_ids[idx] not in kept:
+                idx += 1
+            new_tasks = self.tasks[start:idx]
+            await task_list.insert(start, [self._make_row(task) for task in new_tasks])
+            self._prev_rows[start:start] = [self._row_key(task) for task in new_tasks]
+
+    def _task_class(self, task: Dict[str, Any]) -> str:
+        val = task.get('value', 0)
+        cls = "task-neutral"
+        if val > 1: cls = "task-positive"
+        if val < -1: cls = "task-negative"
+        return cls
+
+    def _row_key(self, task: Dict[str, Any]) -> Tuple[str, str, str]:
+        return (task['id'], task['text'], self._task_class(task))
+
+    def _make_row(self, task: Dict[str, Any]) -> ListItem:
+        return ListItem(Label(task['text'], classes=self._task_class(task)))
+
+    def _rerender_row(self, idx: int):
+        row = self._row_key(self.tasks[idx])
+        if row == self._prev_rows[idx]:
+            return
+        task_list = self.query_one("#task-list", ListView)
+        label = task_list.children[idx].query_one(Label)
+        label.update(row[1])
+        label.set_classes(row[2])
+        self._prev_rows[idx] = row
+
+    async def _remove_row(self, idx: int):
+        del self.tasks[idx]
+        del self._prev_rows[idx]
+        await self.query_one("#task-list", ListView).remove_items([idx])
+
     def update_detail(self):
         task_list = self.query_one("#task-list", ListView)
         detail_view = self.query_one("#task-detail", TaskDetail)
@@ -263,13 +477,21 @@ class HabiticaTUI(App):
         else:
             detail_view.update_task(None)
 
-    def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
+    async def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
         if event.list_view.id == "type-list":
             if event.item and event.item.id:
                 self.selected_type = event.item.id
-                self.refresh_tasks()
+                cached = self._tasks_by_type.get(self.selected_type)
+                if cached is None:
+                    if not self._prefetching:
+                        await self.refresh_tasks()
+                else:
+                    await self._show_tasks(self.selected_type, cached)
         elif event.list_view.id == "task-list":
-            self.update_detail()
+            # Coalesce key-repeat scrolling into a single redraw
+            if self._detail_timer:
+                self._detail_timer.stop()
+            self._detail_timer = self.set_timer(DETAIL_DEBOUNCE, self.update_detail)
 
     def action_focus_left(self):
         self.query_one("#type-list").focus()
@@ -284,21 +506,42 @@ class HabiticaTUI(App):
     def action_focus_previous(self):
         self.screen.focus_previous()
 
-    def action_score_up(self):
-        task_list = self.query_one("#task-list", ListView)
-        if task_list.index is not None:
-            task = self.tasks[task_list.index]
-            self.client.score_task(task['id'], "up")
-            self.notify(f"Scored up: {task['text']}")
-            self.refresh_tasks()
+    async def action_refresh(self):
+        await self.refresh_tasks()
+
+    def _task_index(self, task_id: str) -> Optional[int]:
+        # Network calls yield to the event loop, so re-find rows by id afterwards
+        for idx, task in enumerate(self.tasks):
+            if task['id'] == task_id:
+                return idx
+        return None
+
+    async def action_score_up(self):
+        await self._score_selected("up")
 
-    def action_score_down(self):
+    async def action_score_down(self):
+        await self._score_selected("down")
+
+    async def _score_selected(self, direction: str):
         task_list = self.query_one("#task-list", ListView)
         if task_list.index is not None:
             task = self.tasks[task_list.index]
-            self.client.score_task(task['id'], "down")
-            self.notify(f"Scored down: {task['text']}")
-            self.refresh_tasks()
+            result = await asyncio.to_thread(self.client.score_task, task['id'], direction)
+            # The score endpoint returns user stats plus the task's value delta
+            idx = self._task_index(task['id'])
+            if idx is not None and result and result.get('data'):
+                # A reward's value is its gold cost, which buying it doesn't change
+                if task['type'] != 'reward':
+                    task['value'] = task.get('value', 0) + result['data'].get('delta', 0)
+                if task['type'] == 'todo' and direction == 'up':
+                    # Scoring a todo up completes it, and the list only holds open todos
+                    task['completed'] = True
+                    await self._remove_row(idx)
+                else:
+                    self._rerender_row(idx)
+                self.update_detail()
+            if result:
+                self.notify(f"Scored {direction}: {task['text']}")
 
     def action_edit_task(self):
         task_list = self.query_one("#task-list", ListView)
@@ -306,58 +549,144 @@ class HabiticaTUI(App):
             task = self.tasks[task_list.index]
             self.push_screen(EditTaskModal(task), self.refresh_on_edit)
 
-    def refresh_on_edit(self, updates: Optional[Dict[str, Any]]):
+    async def refresh_on_edit(self, updates: Optional[Dict[str, Any]]):
         if updates:
             task_list = self.query_one("#task-list", ListView)
             task = self.tasks[task_list.index]
-            self.client.update_task(task['id'], **updates)
-            self.notify("Task updated")
-            self.refresh_tasks()
-
-    def action_delete_task(self):
+            result = await asyncio.to_thread(self.client.update_task, task['id'], **updates)
+            idx = self._task_index(task['id'])
+            if idx is not None and result and result.get('data'):
+                self.tasks[idx] = result['data']
+                self._rerender_row(idx)
+                self.update_detail()
+            if result:
+                self.notify("Task updated")
+
+    async def action_delete_task(self):
         task_list = self.query_one("#task-list", ListView)
         if task_list.index is not None:
             task = self.tasks[task_list.index]
-            self.client.delete_task(task['id'])
-            self.notify(f"Deleted: {task['text']}")
-            self.refresh_tasks()
+            result = await asyncio.to_thread(self.client.delete_task, task['id'])
+            idx = self._task_index(task['id'])
+            if idx is not None and result is not None:
+                await self._remove_row(idx)
+                self.update_detail()
+                self.notify(f"Deleted: {task['text']}")
 
     def action_import_tasks(self):
         self.push_screen(ImportModal(), self.run_import)
 
-    def run_import(self, path: Optional[str]):
+    def _iter_csv_tasks(self, path: str) -> Iterator[Dict[str, Any]]:
+        with open(path, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                yield {
+                    "text": row.get('Task Name', row.get('text')),
+                    "type": (row.get('Type') or row.get('type') or 'todo').lower()
+                }
+
+    def _parse_import_file(self, path: str) -> Iterable[Dict[str, Any]]:
+        # CSV is streamed row by row; the other formats are small and parsed whole
+        if path.endswith('.csv'):
+            return self._iter_csv_tasks(path)
+        new_tasks = []
+        if path.endswith(('.yaml', '.yml')):
+            with open(path, 'r') as f:
+                new_tasks = yaml.safe_load(f) or []
+        elif path.endswith('.md'):
+            with open(path, 'r') as f:
+                content = f.read()
+            for task_text in _MD_CHECK.findall(content):
+                new_tasks.append({"text": task_text.strip(), "type": "todo"})
+        return new_tasks
+
+    @work(exclusive=True, group="import")
+    async def run_import(self, path: Optional[str]):
         if not path or not os.path.exists(path):
             if path: self.notify(f"File not found: {path}", severity="error")
             return
         
-        new_tasks = []
+        # Read and parse off the event loop so the UI stays responsive
         try:
-            if path.endswith('.csv'):
-                with open(path, 'r') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        new_tasks.append({
-                            "text": row.get('Task Name', row.get('text')),
-                            "type": row.get('Type', row.get('type', 'todo')).lower()
-                        })
-            elif path.endswith(('.yaml', '.yml')):
-                with open(path, 'r') as f:
-                    new_tasks = yaml.safe_load(f) or []
-            elif path.endswith('.md'):
-                with open(path, 'r') as f:
-                    content = f.read()
-                checklist_matches = re.findall(r"-\s*\[\s*\]\s*(.*)", content)
-                for task_text in checklist_matches:
-                    new_tasks.append({"text": task_text.strip(), "type": "todo"})
+            new_tasks = iter(await asyncio.to_thread(self._parse_import_file, path))
         except Exception as e:
             self.notify(f"Import error: {e}", severity="error")
             return
         
-        for task in new_tasks:
-            self.client.create_task(task.get('text'), task.get('type', 'todo'))
-        
-        self.notify(f"Imported {len(new_tasks)} tasks")
-        self.refresh_tasks()
+        # Feed batches of parsed tasks through a bounded queue to a pool of
+        # uploaders, so the first create fires before the file is fully read
+        queue: asyncio.Queue = asyncio.Queue(maxsize=IMPORT_CONCURRENCY * 2)
+        done = object()
+        imported = 0
+        failed = 0
+        skipped_reasons: List[str] = []
+        errors: List[Exception] = []
+
+        # Bulk creates are all-or-nothing, so weed out entries the server
+        # would reject before they can sink a whole batch
+        def _next_batch():
+            raw = list(itertools.islice(new_tasks, IMPORT_BATCH_SIZE))
+            payload = []
+            for task in raw:
+                if not isinstance(task, dict):
+                    skipped_reasons.append(f"unsupported entry {task!r}")
+                    continue
+                text = task.get('text')
+                task_type = str(task.get('type') or 'todo').lower()
+                if not text:
+                    skipped_reasons.append("entry with no text")
+                elif task_type not in TASK_TYPE_NAMES:
+                    skipped_reasons.append(f"unknown type {task_type!r}")
+                else:
+                    payload.append({"text": text, "type": task_type, "notes": "", "priority": 1})
+            return raw, payload
+
+        async def _produce():
+            nonlocal failed
+            try:
+                while True:
+                    raw, payload = await asyncio.to_thread(_next_batch)
+                    if not raw:
+                        break
+                    failed += len(raw) - len(payload)
+                    if payload:
+                        await queue.put(payload)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                for _ in range(IMPORT_CONCURRENCY):
+                    await queue.put(done)
+
+        async def _consume():
+            nonlocal imported, failed
+            while (payload := await queue.get()) is not done:
+                try:
+                    if await asyncio.to_thread(self.client.create_tasks_bulk, payload) is not None:
+                        imported += len(payload)
+                    else:
+                        failed += len(payload)
+                except Exception as e:
+                    failed += len(payload)
+                    errors.append(e)
+
+        # If a consumer still dies, cancel the rest rather than leave the
+        # producer blocked on a full queue
+        workers = [asyncio.ensure_future(_produce())]
+        workers += [asyncio.ensure_future(_consume()) for _ in range(IMPORT_CONCURRENCY)]
+        try:
+            finished, _ = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        errors += [w.exception() for w in finished if not w.cancelled() and w.exception()]
+        if errors:
+            self.notify(f"Import error after {imported} tasks: {errors[0]}", severity="error")
+        elif failed:
+            detail = f" (skipped {skipped_reasons[0]})" if skipped_reasons else ""
+            self.notify(f"Imported {imported}, failed {failed}{detail}", severity="error")
+        else:
+            self.notify(f"Imported {imported} tasks")
+        # Imported rows can land in any category
+        self.load_tasks()
 
 class ImportModal(ModalScreen):
     def compose(self) -> ComposeResult: